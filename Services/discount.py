@@ -28,52 +28,95 @@ Discount and Promotion Logic Module
 (Put the earlier docstring here!)
 """
 
+from array import array
+from dataclasses import dataclass
 from models.cart import Cart
 from models.coupon import Coupon
+from models._fastmath import (
+    DISCOUNT_TYPE_CODES,
+    UNKNOWN,
+    best_discount_total,
+    discount_amount,
+)
 from typing import List, Dict, Any, Optional
 
+
 # Example discount rule structure
+@dataclass(slots=True, frozen=True)
 class DiscountRule:
-    def __init__(self, name: str, description: str, discount_type: str, value: float, min_order_value: float = 0.0):
-        self.name = name
-        self.description = description
-        self.discount_type = discount_type  # "fixed", "percentage", etc.
-        self.value = value
-        self.min_order_value = min_order_value
-
-    def is_eligible(self, cart: Cart) -> bool:
-        return cart.calculate_subtotal() >= self.min_order_value
-
-    def get_discount(self, cart: Cart) -> float:
-        if not self.is_eligible(cart):
+    name: str
+    description: str
+    discount_type: str  # "fixed", "percentage", etc.
+    value: float
+    min_order_value: float = 0.0
+    # Rules sharing a group don't stack: only the largest applies.
+    # None means the rule is in a group of its own.
+    stackability_group: Optional[str] = None
+
+    def is_eligible(self, cart: Cart, subtotal: Optional[float] = None) -> bool:
+        if subtotal is None:
+            subtotal = cart.calculate_subtotal()
+        return subtotal >= self.min_order_value
+
+    def get_discount(self, cart: Cart, subtotal: Optional[float] = None) -> float:
+        if subtotal is None:
+            subtotal = cart.calculate_subtotal()
+        if not self.is_eligible(cart, subtotal):
             return 0.0
-        if self.discount_type == "fixed":
-            return min(self.value, cart.calculate_subtotal())
-        elif self.discount_type == "percentage":
-            return round(cart.calculate_subtotal() * (self.value / 100), 2)
-        return 0.0
+        return discount_amount(
+            DISCOUNT_TYPE_CODES.get(self.discount_type, UNKNOWN), self.value, subtotal
+        )
+
 
 # Main discount manager (manages rules & coupons)
 class DiscountManager:
     def __init__(self):
         self.discounts: List[DiscountRule] = []
         self.coupons: List[Coupon] = []
+        # Rules are mirrored as parallel typed arrays (struct-of-arrays) so
+        # apply_discounts can evaluate them without per-rule method dispatch.
+        self._types = array("b")
+        self._values = array("d")
+        self._min_orders = array("d")
+        self._group_ids = array("i")  # dense stackability group index per rule
+        self._group_index: Dict[str, int] = {}
+        self._num_groups = 0
 
     def add_discount(self, discount: DiscountRule):
         self.discounts.append(discount)
+        self._types.append(DISCOUNT_TYPE_CODES.get(discount.discount_type, UNKNOWN))
+        self._values.append(discount.value)
+        self._min_orders.append(discount.min_order_value)
+        group = discount.stackability_group
+        if group is None or group not in self._group_index:
+            if group is not None:
+                self._group_index[group] = self._num_groups
+            self._group_ids.append(self._num_groups)
+            self._num_groups += 1
+        else:
+            self._group_ids.append(self._group_index[group])
 
     def apply_discounts(self, cart: Cart) -> float:
         """
         Calculates the maximum applicable discount (from rules + coupons)
-        This can be customized for stacking/not stacking logic.
+        Rules in the same stackability group don't stack: the best one wins,
+        and the per-group winners are summed.
         """
-        total_discount = 0
-        # Apply all discount rules (stacking is just a sum here)
-        for discount in self.discounts:
-            total_discount += discount.get_discount(cart)
-        # Apply all valid coupons
-        for coupon in cart.applied_coupons:
-            total_discount += coupon.get_discount(cart)
+        # Subtotal is computed once and shared by every rule below
+        subtotal = cart.calculate_subtotal()
+        total_discount = best_discount_total(
+            self._types,
+            self._values,
+            self._min_orders,
+            self._group_ids,
+            self._num_groups,
+            subtotal,
+        )
+        # Apply all valid coupons; Coupon.get_discount runs its own cheap
+        # checks (active flag, window, usage cap, minimum order) first and
+        # only reads the clock for coupons with a validity window
+        for coupon in cart.applied_coupons.values():
+            total_discount += coupon.get_discount(cart, subtotal)
         return total_discount
 
     def get_active_discounts(self) -> List[DiscountRule]:
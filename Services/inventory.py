@@ -16,73 +16,380 @@ Key Responsibilities:
 
 Example Methods:
     add_product(product): Add a new Product to inventory.
+    add_products(products): Add many Products in one bulk update.
     remove_product(product_id): Remove a Product from inventory.
     is_in_stock(product_id, quantity): Check if sufficient stock exists.
-    reserve_stock(product_id, quantity): Deduct stock for an order.
+    reserve_stock(product_id, quantity): Hold stock for an order; returns a reservation id.
+    reserve_bulk(items): All-or-nothing hold for several (product_id, quantity) pairs,
+        recorded as one reservation.
+    try_reserve_bulk(items): Same, but returns (ok, id_or_reason) instead of raising.
+    consume(reservation_id): Turn a held reservation into a real stock deduction.
+    settle(reservation_id): Forget a consumed reservation once its order is recorded.
+    release_reservation(reservation_id): Drop a hold (or undo a consumed one).
+    release_bulk(reservation_ids): Release several reservations at once.
     release_stock(product_id, quantity): Replenish stock after cancellation/return.
     get_inventory_status(): Return a summary or detailed view of current inventory.
+    iter_inventory_status(): Same summaries, yielded lazily one product at a time.
     get_low_stock_products(threshold): Return products with stock below threshold.
+    iter_low_stock_products(threshold): Same, yielded lazily.
+    compact(): Switch stock lookups to a list indexed by product_id when ids are dense.
 
 """
 
 # services/inventory.py
 
+import heapq
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from itertools import count
 from models.product import Product
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from config import INVENTORY_RESERVATION_TTL_SEC
 from Utils.exceptions import OutOfStockError
 from Utils.logger import logger
 
 
+# Number of locks in the stripe pool; same-product updates serialize,
+# different products usually land on different stripes.
+LOCK_STRIPES = 64
 
 
+class InventoryReservation:
+    """
+    A temporary hold on stock for one pending checkout, covering every product
+    in it. Held quantities count against availability but leave product.stock
+    untouched until consumed, so an abandoned checkout simply expires instead
+    of leaking stock.
+    """
+
+    __slots__ = ("reservation_id", "items", "expires_at", "status")
+
+    ACTIVE = "ACTIVE"
+    CONSUMED = "CONSUMED"
+    RELEASED = "RELEASED"
+    EXPIRED = "EXPIRED"
+
+    def __init__(self, reservation_id, items, expires_at):
+        self.reservation_id = reservation_id
+        self.items = items  # ((product_id, quantity), ...), one pair per distinct product
+        self.expires_at = expires_at  # time.monotonic() deadline
+        self.status = self.ACTIVE
+
+    def __repr__(self):
+        return (
+            f"InventoryReservation(id={self.reservation_id}, items={self.items}, "
+            f"status={self.status})"
+        )
+
 
 class Inventory:
     def __init__(self, logger=logger):
         """Initializes the inventory with an empty product dictionary and optional logger."""
         self.products: Dict[int, Product] = {}
+        # Optional list form of products indexed directly by product_id (see compact)
+        self._dense_products: Optional[List[Optional[Product]]] = None
         self.logger = logger
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        # Reservation ledger: open reservations, held quantity per product,
+        # and an expiry heap of (expires_at, reservation_id) for lazy sweeping.
+        # Ids come from a plain counter; they only need to be unique per Inventory.
+        self._reservation_ids = count(1)
+        self._reservations: Dict[int, InventoryReservation] = {}
+        self._active_reserved: Counter = Counter()
+        self._expiry_heap = []
+        self._ledger_lock = threading.Lock()
+
+    def _lock(self, product_id) -> threading.Lock:
+        """Return the stripe lock guarding the given product."""
+        return self._stripes[hash(product_id) % LOCK_STRIPES]
+
+    @contextmanager
+    def _locked(self, product_ids):
+        """
+        Hold the stripe locks of every product in product_ids, taken in a fixed
+        order so concurrent multi-product callers can't deadlock; a stripe
+        shared by two products is taken once.
+        """
+        with ExitStack() as stack:
+            for index in sorted({hash(pid) % LOCK_STRIPES for pid in product_ids}):
+                stack.enter_context(self._stripes[index])
+            yield
+
+    def _hold(self, items, ttl: float) -> InventoryReservation:
+        """Record one reservation for items; caller must hold their stripe locks."""
+        reservation = InventoryReservation(
+            next(self._reservation_ids), items, time.monotonic() + ttl
+        )
+        active = self._active_reserved
+        for product_id, quantity in items:
+            active[product_id] += quantity
+        with self._ledger_lock:
+            self._reservations[reservation.reservation_id] = reservation
+            heapq.heappush(
+                self._expiry_heap, (reservation.expires_at, reservation.reservation_id)
+            )
+        return reservation
+
+    def _unhold(self, reservation: InventoryReservation):
+        """Stop counting a reservation's quantities as held; caller holds the locks."""
+        active = self._active_reserved
+        for product_id, quantity in reservation.items:
+            active[product_id] -= quantity
+
+    def _product_ids(self, reservation: InventoryReservation):
+        return [product_id for product_id, _ in reservation.items]
 
     def add_product(self, product: Product):
         """Add or update a Product in inventory."""
         self.products[product.product_id] = product
-        self.logger.info(f"Product added: {product}")
+        self._dense_products = None
+        self.logger.info("Product added: %s", product)
+
+    def add_products(self, products: Iterable[Product]):
+        """Add or update many Products with one bulk update of the product map."""
+        by_id = {product.product_id: product for product in products}
+        self.products.update(by_id)
+        self._dense_products = None
+        self.logger.info("Products added: %s", len(by_id))
 
     def remove_product(self, product_id: int):
         """Remove a product from inventory."""
         if product_id in self.products:
             del self.products[product_id]
-            self.logger.info(f"Product removed: {product_id}")
+            self._dense_products = None
+            self.logger.info("Product removed: %s", product_id)
+
+    def compact(self) -> bool:
+        """
+        Index products by position when product ids are dense non-negative ints
+        (at least half of 0..max_id in use), replacing hash lookups with list
+        indexing. Returns False and keeps dict lookups otherwise.
+        Adding or removing a product drops the dense index; call compact() again.
+        """
+        ids = self.products.keys()
+        if not ids or any(type(pid) is not int or pid < 0 for pid in ids):
+            return False
+        size = max(ids) + 1
+        if size > 2 * len(ids):
+            return False
+        dense: List[Optional[Product]] = [None] * size
+        for pid, product in self.products.items():
+            dense[pid] = product
+        self._dense_products = dense
+        return True
+
+    def _stock_of(self, product_id) -> Optional[int]:
+        """
+        Current stock for product_id, or None if it isn't in inventory.
+        Always read from the Product, so stock changed outside Inventory counts.
+        """
+        dense = self._dense_products
+        if dense is not None and type(product_id) is int and 0 <= product_id < len(dense):
+            product = dense[product_id]
+        else:
+            product = self.products.get(product_id)
+        return None if product is None else product.stock
 
     def is_in_stock(self, product_id: int, quantity: int) -> bool:
-        """Check if the requested quantity is in stock."""
-        product = self.products.get(product_id)
-        return product.is_in_stock(quantity) if product else False
+        """Check if the requested quantity is available (stock minus active holds)."""
+        stock = self._stock_of(product_id)
+        return stock is not None and stock - self._active_reserved[product_id] >= quantity
 
-    def reserve_stock(self, product_id: int, quantity: int) -> bool:
+    def reserve_stock(
+        self, product_id: int, quantity: int, ttl: Optional[float] = None
+    ) -> int:
         """
-        Deduct/reserve stock for an order.
+        Hold stock for an order and return the reservation id.
+        Stock is only deducted once the reservation is consumed.
         Raises OutOfStockError if insufficient stock.
         """
-        product = self.products.get(product_id)
-        if not product or not product.is_in_stock(quantity):
-            raise OutOfStockError(
-                f"{product_id} is out of stock or insufficient quantity"
-            )
-        product.deduct_stock(quantity)
-        self.logger.info(f"Reserved {quantity} of {product_id}")
-        return True
+        self._expire_reservations()
+        ttl = INVENTORY_RESERVATION_TTL_SEC if ttl is None else ttl
+        with self._lock(product_id):
+            stock = self._stock_of(product_id)
+            if stock is None or stock - self._active_reserved[product_id] < quantity:
+                raise OutOfStockError(
+                    f"{product_id} is out of stock or insufficient quantity"
+                )
+            reservation = self._hold(((product_id, quantity),), ttl)
+        self.logger.info("Reserved %s of %s", quantity, product_id)
+        return reservation.reservation_id
+
+    def reserve_bulk(
+        self, items: Iterable[Tuple[int, int]], ttl: Optional[float] = None
+    ) -> int:
+        """
+        Hold stock for several (product_id, quantity) pairs atomically:
+        either every product is reserved or none are.
+        Returns the id of the single reservation covering all of them.
+        Raises OutOfStockError if any product has insufficient stock.
+        """
+        ok, result = self.try_reserve_bulk(items, ttl)
+        if not ok:
+            raise OutOfStockError(result)
+        return result
+
+    def try_reserve_bulk(
+        self, items: Iterable[Tuple[int, int]], ttl: Optional[float] = None
+    ) -> Tuple[bool, Union[int, str]]:
+        """
+        Non-raising reserve_bulk for hot checkout paths.
+        Returns (True, reservation_id) or (False, reason).
+        """
+        self._expire_reservations()
+        ttl = INVENTORY_RESERVATION_TTL_SEC if ttl is None else ttl
+        wanted = Counter()
+        for product_id, quantity in items:
+            wanted[product_id] += quantity
+        with self._locked(wanted):
+            for product_id, quantity in wanted.items():
+                stock = self._stock_of(product_id)
+                if stock is None or stock - self._active_reserved[product_id] < quantity:
+                    return False, f"{product_id} is out of stock or insufficient quantity"
+            reservation = self._hold(tuple(wanted.items()), ttl)
+        self.logger.info("Reserved %s products in bulk", len(wanted))
+        return True, reservation.reservation_id
+
+    def consume(self, reservation_id: int):
+        """
+        Finalize a reservation: deduct every held quantity from product stock.
+        Raises OutOfStockError if the reservation expired or is unknown, or a
+        product was removed or lost stock since; the hold is then left for the
+        caller to release.
+        """
+        reservation = self._reservations.get(reservation_id)
+        if reservation is None:
+            raise OutOfStockError(f"Reservation {reservation_id} expired or unknown")
+        with self._locked(self._product_ids(reservation)):
+            if reservation.status != InventoryReservation.ACTIVE:
+                raise OutOfStockError(f"Reservation {reservation_id} is {reservation.status}")
+            # A hold past its TTL is expired even if no sweep has run yet
+            expired = time.monotonic() > reservation.expires_at
+            if expired:
+                self._unhold(reservation)
+                reservation.status = InventoryReservation.EXPIRED
+            else:
+                # Check every line before changing anything, so a failure
+                # leaves the hold intact and consistent
+                products = []
+                for product_id, quantity in reservation.items:
+                    product = self.products.get(product_id)
+                    if product is None or product.stock < quantity:
+                        raise OutOfStockError(
+                            f"{product_id} is no longer available for reservation {reservation_id}"
+                        )
+                    products.append(product)
+                self._unhold(reservation)
+                for product, (_, quantity) in zip(products, reservation.items):
+                    product.deduct_stock(quantity)
+                reservation.status = InventoryReservation.CONSUMED
+        if expired:
+            with self._ledger_lock:
+                self._reservations.pop(reservation_id, None)
+            raise OutOfStockError(f"Reservation {reservation_id} expired")
+        self.logger.info("Consumed reservation %s", reservation_id)
+
+    def settle(self, reservation_id: int):
+        """
+        Drop a consumed reservation from the ledger once its order is recorded.
+        Until then a consumed reservation can still be released to restock it.
+        """
+        with self._ledger_lock:
+            reservation = self._reservations.get(reservation_id)
+            if reservation is not None and reservation.status == InventoryReservation.CONSUMED:
+                del self._reservations[reservation_id]
+
+    def release_reservation(self, reservation_id: int):
+        """
+        Drop an active hold, or restock a reservation that was already consumed.
+        Released or expired reservations are ignored.
+        """
+        reservation = self._reservations.get(reservation_id)
+        if reservation is None:
+            return
+        with self._locked(self._product_ids(reservation)):
+            if reservation.status == InventoryReservation.ACTIVE:
+                self._unhold(reservation)
+            elif reservation.status == InventoryReservation.CONSUMED:
+                for product_id, quantity in reservation.items:
+                    product = self.products.get(product_id)
+                    if product:
+                        product.restock(quantity)
+            else:
+                return
+            reservation.status = InventoryReservation.RELEASED
+        with self._ledger_lock:
+            self._reservations.pop(reservation_id, None)
+        self.logger.info("Released reservation %s", reservation_id)
+
+    def release_bulk(self, reservation_ids: Iterable[int]):
+        """Release every reservation in reservation_ids (see release_reservation)."""
+        for reservation_id in reservation_ids:
+            self.release_reservation(reservation_id)
+
+    def _expire_reservations(self):
+        """
+        Lazily expire held reservations whose TTL has passed, freeing their stock.
+        Consumed reservations are left in the ledger until settled or released,
+        so a rollback can still restock them.
+        """
+        now = time.monotonic()
+        heap = self._expiry_heap
+        if not heap or heap[0][0] > now:
+            return
+        due = []
+        with self._ledger_lock:
+            while heap and heap[0][0] <= now:
+                _, reservation_id = heapq.heappop(heap)
+                reservation = self._reservations.get(reservation_id)
+                if reservation is not None:
+                    due.append(reservation)
+        expired = []
+        for reservation in due:
+            with self._locked(self._product_ids(reservation)):
+                if reservation.status != InventoryReservation.ACTIVE:
+                    continue
+                self._unhold(reservation)
+                reservation.status = InventoryReservation.EXPIRED
+            expired.append(reservation.reservation_id)
+            self.logger.info("Reservation %s expired", reservation.reservation_id)
+        if expired:
+            with self._ledger_lock:
+                for reservation_id in expired:
+                    self._reservations.pop(reservation_id, None)
 
     def release_stock(self, product_id: int, quantity: int):
         """Restock inventory after cancellation/return."""
-        product = self.products.get(product_id)
+        with self._lock(product_id):
+            product = self.products.get(product_id)
+            if product:
+                product.restock(quantity)
         if product:
-            product.restock(quantity)
-            self.logger.info(f"Released {quantity} back to {product_id}")
+            self.logger.info("Released %s back to %s", quantity, product_id)
+
+    def iter_inventory_status(self) -> Iterator[Dict]:
+        """
+        Lazily yield a summary per product, read live as the caller iterates,
+        so monitoring scans never hold a full list or see stale data.
+        """
+        for product in self.products.values():
+            yield product.get_info()
 
     def get_inventory_status(self) -> List[Dict]:
         """Return product summaries for all products in inventory."""
-        return [product.get_info() for product in self.products.values()]
+        return list(self.iter_inventory_status())
+
+    def iter_low_stock_products(self, threshold: int) -> Iterator[Dict]:
+        """
+        Lazily yield summaries of products at or below the stock threshold;
+        only matching products pay for a get_info() dict.
+        """
+        for product in self.products.values():
+            if product.stock <= threshold:
+                yield product.get_info()
 
     def get_low_stock_products(self, threshold: int) -> List[Dict]:
         """Return list of products at or below the given stock threshold."""
-        return [p.get_info() for p in self.products.values() if p.stock <= threshold]
+        return list(self.iter_low_stock_products(threshold))
@@ -16,6 +16,8 @@ Key Responsibilities:
 
 Example Methods:
     submit_order(user, cart, payment_info): Full checkout orchestration
+    submit_order_async(user, cart, payment_info): Same checkout, awaiting the payment step
+    submit_order_batch(checkouts): Checkout many (user, cart, payment_info) entries in one pass
     cancel_order(order_id): Handle order cancellation and inventory/payment updates
     get_orders_for_user(user_id): List all orders placed by a user
 
@@ -32,8 +34,9 @@ from models.user import User
 from models.cart import Cart
 from models.order import Order
 from Services.inventory import Inventory, OutOfStockError
-from Services.payment_gateway import PaymentProcessor, PaymentFailedError
-from typing import Dict, Any, List
+from Services.payment_gateway import PaymentProcessor
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import uuid4
 from Utils.logger import logger
 
 
@@ -45,60 +48,175 @@ class OrderServices:
         self.payment_gateway = payment_gateway
         self.logger = logger
         self.orders = []  # track all orders globally
+        self._orders_by_id: Dict[str, Order] = {}  # order_id -> Order index
 
     def submit_order(
         self, user: User, cart: Cart, payment_info: Dict[str, Any]
     ) -> Order | None:
+        held = self._hold_cart(user, cart)
+        if held is None:
+            return None
+        reservation, total = held
+
+        # Process payment
+        ok, payment_ref = self.payment_gateway.try_process_payment(
+            user, total, payment_info
+        )
+        return self._complete(user, cart, reservation, total, ok, payment_ref)
+
+    async def submit_order_async(
+        self, user: User, cart: Cart, payment_info: Dict[str, Any]
+    ) -> Order | None:
+        """
+        Same checkout as submit_order, but awaits the payment step so many
+        checkouts can overlap their (simulated) gateway latency.
+        """
+        held = self._hold_cart(user, cart)
+        if held is None:
+            return None
+        reservation, total = held
+
+        ok, payment_ref = await self.payment_gateway.process_payment_async(
+            user, total, payment_info
+        )
+        return self._complete(user, cart, reservation, total, ok, payment_ref)
+
+    def _hold_cart(self, user: User, cart: Cart) -> Optional[Tuple[int, float]]:
+        """
+        Reserve stock for the whole cart and price it, ahead of payment.
+        Returns (reservation, total), or None if the order can't go ahead.
+        """
         if not cart.items:
             self.logger.info("Cart is empty, cannot submit order.")
             return None
 
-        reserved = []
+        # Hold stock for the whole cart at once; nothing is deducted
+        # until payment succeeds
+        ok, reservation = self.inventory.try_reserve_bulk(cart.iter_quantities())
+        if not ok:
+            self.logger.info("Order failed for User %s: %s", user.user_id, reservation)
+            return None
+        return reservation, cart.calculate_total()
+
+    def _complete(
+        self, user: User, cart: Cart, reservation: int, total: float, ok: bool, payment_ref: str
+    ) -> Order | None:
+        """Finalize a paid checkout, or release its hold if payment was declined."""
+        if not ok:
+            self.inventory.release_reservation(reservation)
+            self.logger.info("Order failed for User %s: %s", user.user_id, payment_ref)
+            return None
+        return self._finalize(user, cart, reservation, payment_ref, total)
+
+    def _finalize(
+        self, user: User, cart: Cart, reservation: int, payment_ref: str, total: float
+    ) -> Order | None:
+        """Consume the held stock and record the order once payment went through."""
         try:
-            # Reserve stock
-            for pid, (product, qty) in cart.items.items():
-                self.inventory.reserve_stock(pid, qty)
-                reserved.append((pid, qty))
-
-            # Process payment
-            order_preview = Order.from_cart("preview", cart)
-            payment_ref = self.payment_gateway.process_payment(
-                user, order_preview, payment_info
-            )
-
-            # Create order
-            order_id = f"ORD-{user.user_id}-{len(self.orders)+1}"
-            order = Order.from_cart(order_id, cart)
-            order.payment_ref = payment_ref
-            order.status = "Paid"
-
-            # Save order
-            self.orders.append(order)
-            user.order_history.append(order)
-
-            self.logger.info(
-                f"Order {order_id} placed successfully for User {user.user_id}"
-            )
-            return order
-
-        except (OutOfStockError, PaymentFailedError) as e:
-            # Rollback reserved stock
-            for pid, qty in reserved:
-                self.inventory.release_stock(pid, qty)
-            self.logger.info(f"Order failed for User {user.user_id}: {e}")
+            # Payment went through: turn the hold into real deductions
+            self.inventory.consume(reservation)
+        except OutOfStockError as e:
+            # The hold expired or a product went away after the charge went
+            # through: drop the hold and refund
+            self.inventory.release_reservation(reservation)
+            self.payment_gateway.refund_payment(payment_ref, total)
+            self.logger.info("Order failed for User %s: %s", user.user_id, e)
             return None
+        self.inventory.settle(reservation)
 
-    def cancel_order(self, user_id: int, order_id: str) -> bool:
-        # Find the order in self.orders
-        order = next(
-            (o for o in self.orders if o.user_id == user_id and o.order_id == order_id),
-            None,
+        # Create order
+        order_id = f"ORD-{user.user_id}-{uuid4().hex[:8]}"
+        order = Order.from_cart(order_id, cart)
+        order.payment_ref = payment_ref
+        order.status = "Paid"
+
+        # Save order
+        self.orders.append(order)
+        self._orders_by_id[order_id] = order
+        user.order_history.append(order)
+
+        self.logger.info(
+            "Order %s placed successfully for User %s", order_id, user.user_id
+        )
+        return order
+
+    def submit_order_batch(
+        self, checkouts: List[Tuple[User, Cart, Dict[str, Any]]]
+    ) -> List[Optional[Order]]:
+        """
+        Place many orders in one pass: reserve stock per cart, authorize all
+        held carts' payments with a single gateway call, release the holds of
+        declined carts, then finalize the rest through _finalize.
+        Carts that were short of stock get another round if declined carts
+        freed some. Every checkout stays all-or-nothing on its own; returns an
+        Order or None per checkout, in input order.
+        """
+        results: List[Optional[Order]] = [None] * len(checkouts)
+        pending = [
+            (position, user, cart, payment_info)
+            for position, (user, cart, payment_info) in enumerate(checkouts)
+            if cart.items
+        ]
+        while pending:
+            # 1. Hold stock for every pending cart
+            held, short = [], []  # (checkout, reservation, total) / (checkout, reason)
+            for checkout in pending:
+                ok, reservation = self.inventory.try_reserve_bulk(
+                    checkout[2].iter_quantities()
+                )
+                if ok:
+                    held.append((checkout, reservation, checkout[2].calculate_total()))
+                else:
+                    short.append((checkout, reservation))
+
+            # 2. Authorize all payments for the held carts at once
+            payment_refs = []
+            if held:
+                payment_refs = self.payment_gateway.authorize_many(
+                    [(user, total, info) for (_, user, _, info), _, total in held]
+                )
+
+            # 3. Release declined holds before anything is consumed, so their
+            # stock is free for the rest of the batch
+            approved = []
+            for (checkout, reservation, total), payment_ref in zip(held, payment_refs):
+                if payment_ref is None:
+                    self.inventory.release_reservation(reservation)
+                    self.logger.info(
+                        "Order failed for User %s: payment declined", checkout[1].user_id
+                    )
+                else:
+                    approved.append((checkout, reservation, total, payment_ref))
+            released = len(approved) < len(held)
+
+            # 4. Consume stock and record orders
+            for (position, user, cart, _), reservation, total, payment_ref in approved:
+                results[position] = self._finalize(
+                    user, cart, reservation, payment_ref, total
+                )
+
+            # Carts short of stock retry only if declined carts freed some
+            if released:
+                pending = [checkout for checkout, _ in short]
+            else:
+                for (_, user, _, _), reason in short:
+                    self.logger.info("Order failed for User %s: %s", user.user_id, reason)
+                pending = []
+
+        self.logger.info(
+            "Batch placed %s of %s orders",
+            len(results) - results.count(None),
+            len(checkouts),
         )
-        if not order:
-            self.logger.info(f"Order {order_id} not found for User {user_id}")
+        return results
+
+    def cancel_order(self, user_id: int, order_id: str) -> bool:
+        order = self._orders_by_id.get(order_id)
+        if not order or order.user_id != user_id:
+            self.logger.info("Order %s not found for User %s", order_id, user_id)
             return False
         if order.status == "Cancelled":
-            self.logger.info(f"Order {order_id} already cancelled")
+            self.logger.info("Order %s already cancelled", order_id)
             return False
 
         order.status = "Cancelled"
@@ -106,11 +224,11 @@ class OrderServices:
             self.inventory.release_stock(pid, qty)
 
         # Refund if payment exists
-        if hasattr(order, "payment_ref"):
+        if order.payment_ref is not None:
             try:
                 self.payment_gateway.refund_payment(order.payment_ref, order.total)
             except Exception as e:
-                self.logger.info(f"Refund failed for Order {order_id}: {e}")
+                self.logger.info("Refund failed for Order %s: %s", order_id, e)
 
-        self.logger.info(f"Order {order_id} cancelled successfully")
+        self.logger.info("Order %s cancelled successfully", order_id)
         return True
@@ -15,7 +15,10 @@ Key Responsibilities:
     - Raise custom exceptions (e.g., PaymentFailedError) on failure.
 
 Example Methods:
-    process_payment(user, order, payment_info): Process and validate the payment for a given order.
+    process_payment(user, amount, payment_info): Process and validate a payment of the given amount.
+    try_process_payment(user, amount, payment_info): Same, but returns (ok, ref_or_reason) instead of raising.
+    process_payment_async(user, amount, payment_info): Awaitable try_process_payment with simulated latency.
+    authorize_many(charges): Process a batch of (user, amount, payment_info) charges in one pass.
     refund_payment(order, amount): Simulate refunding payment to a customer (optional).
     validate_payment_info(payment_info): Check if card/UPI/wallet info is well-formed.
     log_transaction(details): Log each payment event or error (optional).
@@ -26,60 +29,107 @@ Notes:
 """
 
 from models.user import User
-from models.order import Order
 from models.cart import Cart
 from Utils.logger import logger  # For logging payment events
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
 import random
 from Utils.exceptions import PaymentFailedError
+from config import PAYMENT_PROCESS_DELAY_SEC
 
 
+@dataclass(slots=True)
 class PaymentProcessor:
-    def __init__(self, success_rate=0.9):
-        """
-        success_rate: probability [0,1] that a payment will succeed
-        """
-        self.success_rate = success_rate
-        logger.info(f"PaymentProcessor created with success_rate={self.success_rate}")
+    success_rate: float = 0.9  # probability [0,1] that a payment will succeed
+    # Private generator so concurrent processors don't share the global random state
+    _rng: random.Random = field(
+        init=False, repr=False, compare=False, default_factory=random.Random
+    )
+
+    def __post_init__(self):
+        logger.info("PaymentProcessor created with success_rate=%s", self.success_rate)
 
     def validate_payment_info(self, payment_info: Dict[str, Any]) -> bool:
         """
         Check if payment_info dictionary has minimally required fields.
         In real systems, validate card numbers, expiry, etc.
         """
-        required = ["method", "card_number", "cvv"]  # Example for card payment
-        for field in required:
-            if field not in payment_info:
-                logger.warning(f"Validation failed: missing {field}")
+        required = ("method", "card_number", "cvv")  # Example for card payment
+        for key in required:
+            if key not in payment_info:
+                logger.warning("Validation failed: missing %s", key)
                 return False
         return True
 
     def process_payment(
-        self, user: User, order: Order, payment_info: Dict[str, Any]
+        self, user: User, amount: float, payment_info: Dict[str, Any]
     ) -> str:
         """
-        Attempt to charge the user's payment method for the order amount.
+        Attempt to charge the user's payment method for the given amount.
         Returns a payment reference string or raises PaymentFailedError.
         """
-        logger.info(
-            f"Payment attempt: user={user.user_id}, order={order.order_id}, amt={order.total}"
-        )
+        ok, result = self.try_process_payment(user, amount, payment_info)
+        if not ok:
+            raise PaymentFailedError(result)
+        return result
+
+    def try_process_payment(
+        self, user: User, amount: float, payment_info: Dict[str, Any]
+    ) -> Tuple[bool, str]:
+        """
+        Non-raising process_payment for hot checkout paths.
+        Returns (True, payment_ref) or (False, reason).
+        """
+        logger.info("Payment attempt: user=%s, amt=%s", user.user_id, amount)
         if not self.validate_payment_info(payment_info):
             logger.error("Validation failed: Incomplete or invalid payment info.")
-            raise PaymentFailedError("Invalid payment information supplied.")
+            return False, "Invalid payment information supplied."
 
         # Simulate payment gateway (randomly fail some payments)
-        if random.random() < self.success_rate:
-            payment_id = f"PAY-{order.order_id}-{random.randint(1000,9999)}"
-            logger.info(f"Payment succeeded: {payment_id}")
-            return payment_id
+        if self._rng.random() < self.success_rate:
+            payment_id = f"PAY-{user.user_id}-{self._rng.randint(1000,9999)}"
+            logger.info("Payment succeeded: %s", payment_id)
+            return True, payment_id
         else:
             logger.error("Payment failed by gateway simulation.")
-            raise PaymentFailedError("Payment gateway declined the transaction.")
+            return False, "Payment gateway declined the transaction."
+
+    async def process_payment_async(
+        self, user: User, amount: float, payment_info: Dict[str, Any]
+    ) -> Tuple[bool, str]:
+        """
+        try_process_payment after the simulated gateway latency
+        (config.PAYMENT_PROCESS_DELAY_SEC), awaited instead of blocking.
+        """
+        await asyncio.sleep(PAYMENT_PROCESS_DELAY_SEC)
+        return self.try_process_payment(user, amount, payment_info)
+
+    def authorize_many(
+        self, charges: List[Tuple[User, float, Dict[str, Any]]]
+    ) -> List[Optional[str]]:
+        """
+        Process a batch of (user, amount, payment_info) charges in one pass.
+        Returns a payment reference per charge, or None where the charge was
+        declined or the payment info was invalid. Does not raise.
+        """
+        rand, randint, success_rate = self._rng.random, self._rng.randint, self.success_rate
+        refs = []
+        for user, amount, payment_info in charges:
+            if self.validate_payment_info(payment_info) and rand() < success_rate:
+                refs.append(f"PAY-{user.user_id}-{randint(1000,9999)}")
+            else:
+                refs.append(None)
+        logger.info(
+            "Batch payment: %s of %s charges succeeded",
+            len(refs) - refs.count(None),
+            len(refs),
+        )
+        return refs
 
     def refund_payment(self, payment_ref: str, amount: float):
         """
         Simulate refund for a given payment reference.
         """
-        logger.info(f"Refund processed for {payment_ref}: amount={amount}")
+        logger.info("Refund processed for %s: amount=%s", payment_ref, amount)
         return True
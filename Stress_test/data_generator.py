@@ -8,7 +8,8 @@ Purpose:
 Key Responsibilities:
     - Generate a configurable number of sample users, products, and orders with randomized attributes.
     - Support batch creation to populate the system prior to stress test runs.
-    - Optionally, support seeding for reproducible tests.
+    - Optionally, support seeding for reproducible tests: every generator accepts an
+      rng (a random.Random instance); by default the shared module-level generator is used.
 
 Example Methods:
     generate_products(n):        Returns a list of n Product objects with random details.
@@ -27,63 +28,84 @@ from models.cart import Cart
 from models.coupon import Coupon
 
 
-def random_string(length=6):
+def random_string(length=6, rng=None):
     """Generate a random string of given length."""
-    return "".join(random.choices(string.ascii_letters, k=length))
+    rng = random if rng is None else rng
+    return "".join(rng.choices(string.ascii_letters, k=length))
 
 
-def generate_products(n=10):
+def _random_strings(count, length, rng):
+    """
+    count random strings of the given length, drawn with one rng.choices call
+    and sliced apart. Consumes rng exactly as count random_string calls would.
+    """
+    letters = "".join(rng.choices(string.ascii_letters, k=count * length))
+    return [letters[i : i + length] for i in range(0, count * length, length)]
+
+
+def generate_products(n=10, rng=None):
     """Generate n sample products with random attributes."""
+    rng = random if rng is None else rng
     categories = ["Electronics", "Clothing", "Books", "Home", "Toys"]
-    products = []
-    for i in range(1, n + 1):
-        name = f"{random.choice(categories)}-{random_string(4)}"
-        price = round(random.uniform(100, 50000), 2)
-        stock = random.randint(1, 50)
-        category = random.choice(categories)
-        product = Product(
-            product_id=i, name=name, price=price, stock=stock, category=category
+    # Draw each attribute for all n products in one batch, then build objects
+    uniform = rng.uniform
+    # Name prefix and category are independent draws; take both in one call
+    drawn_categories = rng.choices(categories, k=2 * n)
+    name_categories = drawn_categories[:n]
+    product_categories = drawn_categories[n:]
+    prices = [round(uniform(100, 50000), 2) for _ in range(n)]
+    stocks = rng.choices(range(1, 51), k=n)
+    suffixes = _random_strings(n, 4, rng)
+    return [
+        Product(
+            product_id=i + 1,
+            name=f"{name_categories[i]}-{suffixes[i]}",
+            price=prices[i],
+            stock=stocks[i],
+            category=product_categories[i],
         )
-        products.append(product)
-    return products
+        for i in range(n)
+    ]
 
 
-def generate_users(n=5):
+def generate_users(n=5, rng=None):
     """Generate n sample users with random details."""
+    rng = random if rng is None else rng
     users = []
-    for i in range(1, n + 1):
-        name = f"User-{random_string(5)}"
+    for i, suffix in enumerate(_random_strings(n, 5, rng), start=1):
+        name = f"User-{suffix}"
         email = f"{name.lower()}@example.com"
         user = User(user_id=i, name=name, email=email)
         users.append(user)
     return users
 
 
-def generate_carts(users, products, max_items=3):
+def generate_carts(users, products, max_items=3, rng=None):
     """Generate a cart for each user with random product selections."""
+    rng = random if rng is None else rng
     carts = []
-    for user in users:
+    sample, choices = rng.sample, rng.choices
+    cart_sizes = choices(range(1, max_items + 1), k=len(users))
+    for user, k in zip(users, cart_sizes):
         cart = Cart(user_id=user.user_id, cart_id=f"CART-{user.user_id}")
-        chosen = random.sample(products, k=random.randint(1, max_items))
-        for product in chosen:
-            qty = random.randint(1, 2)
-            cart.add_item(product, qty)
+        cart.add_items(zip(sample(products, k=k), choices((1, 2), k=k)))
         carts.append(cart)
     return carts
 
 
-def generate_coupons(n=3):
+def generate_coupons(n=3, rng=None):
     """Generate n sample coupons with random discount rules."""
+    rng = random if rng is None else rng
     coupons = []
     for i in range(1, n + 1):
-        code = f"COUPON{i}{random_string(2).upper()}"
-        discount_type = random.choice(["fixed", "percentage"])
+        code = f"COUPON{i}{random_string(2, rng).upper()}"
+        discount_type = rng.choice(["fixed", "percentage"])
         value = (
-            random.randint(50, 5000)
+            rng.randint(50, 5000)
             if discount_type == "fixed"
-            else random.randint(5, 20)
+            else rng.randint(5, 20)
         )
-        min_order_value = random.randint(0, 2000)
+        min_order_value = rng.randint(0, 2000)
         coupon = Coupon(
             code=code,
             description=f"{value}{'%' if discount_type=='percentage' else '₹'} OFF",  # 👈 yeh add kar diya
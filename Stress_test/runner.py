@@ -20,19 +20,219 @@ Notes:
     Only relevant for testing/benchmarking—should not be deployed in a real environment.
 """
 
+import asyncio
+import os
+from array import array
+from datetime import datetime
 import time
 import random
+from multiprocessing import Pool, Queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from Stress_test.data_generator import (
     generate_products,
     generate_users,
-    generate_carts,
     generate_coupons,
 )
+from models.cart import Cart
 from Services.inventory import Inventory
 from Services.payment_gateway import PaymentProcessor
 from Services.order_services import OrderServices
-from Utils.logger import info, warning, error
+from Utils.logger import (
+    info,
+    warning,
+    set_level,
+    disable,
+    enable,
+    flush,
+    start_queue_logging,
+    stop_queue_logging,
+    use_queue,
+)
+from config import CFG
+
+# Every simulated checkout pays with the same card; built once and shared
+PAYMENT_INFO = {
+    "method": "credit_card",
+    "card_number": "12341234",
+    "cvv": "555",
+}
+
+class CartPool:
+    """
+    Bounded free list of emptied carts, reused within a single stress run.
+    Carts released while maxsize carts are already pooled are simply dropped.
+    """
+
+    __slots__ = ("_free", "maxsize")
+
+    def __init__(self, maxsize):
+        self._free = []
+        self.maxsize = maxsize
+
+    def acquire(self, cart_id, user_id):
+        """Take an empty cart from the pool (or create one) and assign it to user_id."""
+        if self._free:
+            cart = self._free.pop()
+            cart.cart_id = cart_id
+            cart.user_id = user_id
+            # A reused cart starts a new lifetime
+            cart.created_at = cart.updated_at = datetime.now()
+            return cart
+        return Cart(cart_id=cart_id, user_id=user_id)
+
+    def release(self, cart):
+        """Empty a cart that is done with checkout and keep it if there is room."""
+        cart.clear()
+        if len(self._free) < self.maxsize:
+            self._free.append(cart)
+
+
+def _sample_indices(n, k, rng):
+    """
+    Yield min(n, k) distinct random indices in range(n) using a partial
+    Fisher-Yates shuffle. Swapped slots are tracked in a dict, so the work
+    and memory are O(k) rather than O(n).
+    """
+    swapped = {}
+    for i in range(min(n, k)):
+        j = rng.randrange(i, n)
+        yield swapped.get(j, j)
+        swapped[j] = swapped.get(i, i)
+
+
+def _checkouts(
+    num_orders, users, products, coupons, max_cart_items, coupon_prob, rng, pool
+):
+    """
+    Yield (index, user, cart) for num_orders random checkouts, with carts
+    taken from pool (a CartPool).
+    Each cart is built directly: one random user, 1..max_cart_items distinct
+    products with quantity 1-2, and sometimes a coupon.
+    Per-checkout user, cart size and coupon choices are drawn up front in
+    batches from rng, so the loop only indexes into lists.
+    """
+    user_picks = rng.choices(users, k=num_orders)
+    cart_sizes = rng.choices(range(1, max_cart_items + 1), k=num_orders)
+    if coupons:
+        coupon_rolls = [rng.random() < coupon_prob for _ in range(num_orders)]
+        coupon_picks = rng.choices(coupons, k=num_orders)
+    sample, choices, acquire = rng.sample, rng.choices, pool.acquire
+    for i in range(num_orders):
+        user = user_picks[i]
+        k = cart_sizes[i]
+        cart = acquire(f"CART-{user.user_id}-{i+1}", user.user_id)
+        cart.add_items(zip(sample(products, k), choices((1, 2), k=k)))
+        # Randomly apply coupon to some carts
+        if coupons and coupon_rolls[i]:
+            cart.apply_coupon(coupon_picks[i])
+        yield i, user, cart
+
+
+def _drive(
+    order_services, checkouts, num_orders, batch_size, placed_orders, totals, pool,
+    _info=info, _warn=warning,
+):
+    """
+    Sequential inner loop of the stress test: submit checkouts in batches,
+    append placed orders to placed_orders and their totals to the parallel
+    totals array, return finished carts to pool, and return (successes, failures).
+    Kept free of closures and globals so the hot loop only touches locals;
+    module helpers are bound as default arguments for the same reason.
+    """
+    submit_batch = order_services.submit_order_batch
+    release = pool.release
+    place = placed_orders.append
+    add_total = totals.append
+    payment_info = PAYMENT_INFO
+    successes = failures = 0
+    pending = []
+    for i, user, cart in checkouts:
+        pending.append((i, user, cart))
+        if len(pending) < batch_size and i + 1 < num_orders:
+            continue
+        orders = submit_batch([(user, cart, payment_info) for _, user, cart in pending])
+        for (i, _, cart), order in zip(pending, orders):
+            release(cart)
+            if order:
+                successes += 1
+                place(order)
+                add_total(order.total)
+                _info("[ORDER %d] Success: %s, Total: %s", i + 1, order.order_id, order.total)
+            else:
+                failures += 1
+                _warn("[ORDER %d] Failed", i + 1)
+        pending.clear()
+    return successes, failures
+
+
+async def _drive_async(
+    order_services, checkouts, concurrency, placed_orders, totals, pool
+):
+    """
+    asyncio counterpart of _drive: `concurrency` worker tasks share the
+    checkouts iterator, each pulling its next checkout only after the
+    previous one finished, so at most that many carts exist at once.
+    Returns (successes, failures).
+    """
+    checkouts = iter(checkouts)
+    submit = order_services.submit_order_async
+
+    async def worker():
+        successes = failures = 0
+        for i, user, cart in checkouts:
+            order = await submit(user, cart, PAYMENT_INFO)
+            pool.release(cart)
+            if order:
+                successes += 1
+                placed_orders.append(order)
+                totals.append(order.total)
+                info("[ORDER %d] Success: %s, Total: %s", i + 1, order.order_id, order.total)
+            else:
+                failures += 1
+                warning("[ORDER %d] Failed", i + 1)
+        return successes, failures
+
+    results = await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def _worker_run(
+    shard, num_shards, num_orders, products, users, coupons, max_cart_items,
+    coupon_prob, payment_success_rate, batch_size, seed, verbose,
+):
+    """
+    Run one shard of a multi-process stress test and return
+    (successes, failures, order_totals).
+    The worker owns a private Inventory holding its share of every product's
+    stock, so shards never contend and total stock across shards is unchanged.
+    """
+    if not verbose:
+        disable()
+    try:
+        for product in products:
+            share, extra = divmod(product.stock, num_shards)
+            product.stock = share + (1 if shard < extra else 0)
+        inventory = Inventory()
+        inventory.add_products(products)
+        inventory.compact()
+        order_services = OrderServices(
+            inventory, PaymentProcessor(success_rate=payment_success_rate)
+        )
+        rng = random.Random(seed + shard)
+        pool = CartPool(batch_size)
+        checkouts = _checkouts(
+            num_orders, users, products, coupons, max_cart_items, coupon_prob, rng, pool
+        )
+        placed_orders, totals = [], array("d")
+        successes, failures = _drive(
+            order_services, checkouts, num_orders, batch_size, placed_orders, totals, pool
+        )
+        return successes, failures, totals
+    finally:
+        flush()
+        if not verbose:
+            enable()
 
 
 def run_stress_test(
@@ -42,67 +242,168 @@ def run_stress_test(
     max_cart_items=5,
     coupon_prob=0.4,
     payment_success_rate=0.95,
+    max_workers=1,
+    log_level="WARNING",
+    batch_size=256,
+    verbose=False,
+    processes=None,
+    use_async=False,
+    concurrency=128,
 ):
-    # 1. Generate test data
-    products = generate_products(num_products)
-    users = generate_users(num_users)
-    coupons = generate_coupons(5)
-
-    # 2. Prepare services
-    inventory = Inventory()
-    for product in products:
-        inventory.add_product(product)
-    payment_gateway = PaymentProcessor(success_rate=payment_success_rate)
-    order_services = OrderServices(inventory, payment_gateway)
-
-    # 3. Run high-volume order workflow
-    successes, failures = 0, 0
-    placed_orders = []
-    t0 = time.time()
+    """
+    Sequential runs submit checkouts in batches of batch_size through
+    OrderServices.submit_order_batch.
+    max_workers > 1 submits the checkouts concurrently from a thread pool;
+    the striped inventory locks keep stock consistent across workers.
+    processes > 1 shards the orders across a multiprocessing.Pool instead,
+    each worker with its own slice of the stock; by default this is used
+    (with one process per CPU) when config.ENABLE_CONCURRENT_ORDERS is set.
+    Orders stay in the workers, so the cancellation sample is skipped then.
+    use_async drives checkouts through OrderServices.submit_order_async with
+    up to `concurrency` in flight, logging through a queue handler.
+    Logging is disabled for the run unless verbose is set; log_level then
+    defaults to WARNING so per-order INFO records are skipped. Either way the
+    logger is put back as it was when the run ends.
+    """
+    # Logging settings only apply for this run; they are restored afterwards
+    if verbose:
+        previous_level = set_level(log_level)
+    else:
+        disable()
+    try:
+        # One seeded generator drives all test data, so runs are repeatable
+        rng = random.Random(CFG.RANDOM_SEED)
 
-    for i in range(num_orders):
-        user = random.choice(users)
-        cart = random.choice(generate_carts([user], products, max_cart_items))
-        # Randomly apply coupon to some carts
-        if coupons and random.random() < coupon_prob:
-            cart.apply_coupon(random.choice(coupons))
-        payment_info = {
-            "method": "credit_card",
-            "card_number": "12341234",
-            "cvv": "555",
-        }
-        order = order_services.submit_order(user, cart, payment_info)
-        if order:
-            successes += 1
-            placed_orders.append(order)
-            info(f"[ORDER {i+1}] Success: {order.order_id}, Total: {order.total}")
+        # 1. Generate test data
+        products = generate_products(num_products, rng=rng)
+        users = generate_users(num_users, rng=rng)
+        coupons = generate_coupons(5, rng=rng)
+
+        if processes is None:
+            processes = os.cpu_count() if CFG.ENABLE_CONCURRENT_ORDERS else 1
+
+        # 2. Prepare services
+        inventory = Inventory()
+        inventory.add_products(products)
+        inventory.compact()  # generated ids are 1..n, so stock can be list-indexed
+        payment_gateway = PaymentProcessor(success_rate=payment_success_rate)
+        order_services = OrderServices(inventory, payment_gateway)
+
+        # 3. Run high-volume order workflow
+        successes, failures = 0, 0
+        placed_orders = []
+        totals = array("d")  # order totals, parallel to placed_orders
+        t0 = time.time()
+
+        if processes > 1:
+            shard_sizes = [
+                num_orders // processes + (1 if shard < num_orders % processes else 0)
+                for shard in range(processes)
+            ]
+            # Write out buffered records before forking, so workers don't
+            # inherit (and later re-write) them; workers then log through a
+            # queue and only this process touches the log file
+            flush()
+            log_queue = Queue()
+            listener = start_queue_logging(log_queue)
+            try:
+                with Pool(
+                    processes=processes, initializer=use_queue, initargs=(log_queue,)
+                ) as pool:
+                    results = pool.starmap(
+                        _worker_run,
+                        [
+                            (
+                                shard, processes, shard_sizes[shard], products, users,
+                                coupons, max_cart_items, coupon_prob,
+                                payment_success_rate, batch_size, CFG.RANDOM_SEED, verbose,
+                            )
+                            for shard in range(processes)
+                        ],
+                    )
+                    # Let workers exit normally so their queued records are sent
+                    pool.close()
+                    pool.join()
+            finally:
+                stop_queue_logging(listener)
+            for shard_successes, shard_failures, shard_totals in results:
+                successes += shard_successes
+                failures += shard_failures
+                totals.extend(shard_totals)
         else:
-            failures += 1
-            warning(f"[ORDER {i+1}] Failed")
-    t1 = time.time()
-
-    # 4. Print summary stats
-    print("\n--- STRESS TEST SUMMARY ---")
-    print(f"Total orders attempted:   {num_orders}")
-    print(f"Orders successfully placed: {successes}")
-    print(f"Failed attempts:          {failures}")
-    print(f"Total runtime:            {t1 - t0:.2f} seconds")
-    if successes:
-        avg_order_value = sum(o.total for o in placed_orders) / successes
-        print(f"Avg order value:         ₹{avg_order_value:.2f}")
-        print(f"Max order value:         ₹{max(o.total for o in placed_orders):.2f}")
-        print(f"Min order value:         ₹{min(o.total for o in placed_orders):.2f}")
-
-    # Optionally, test cancellation rate
-    cancels = 0
-    for order in random.sample(placed_orders, k=min(len(placed_orders), 20)):
-        result = order_services.cancel_order(order.user_id, order.order_id)
-        if result:
-            cancels += 1
-            info(f"Order {order.order_id} cancelled.")
-    if cancels:
-        print(f"Orders cancelled in test: {cancels}")
+            # Carts are recycled for this run only; the pool keeps at most as
+            # many as the chosen mode has in flight at once
+            pool = CartPool(
+                concurrency if use_async else max_workers if max_workers > 1 else batch_size
+            )
+            checkouts = _checkouts(
+                num_orders, users, products, coupons, max_cart_items, coupon_prob, rng, pool
+            )
+            if use_async:
+                listener = start_queue_logging()
+                try:
+                    successes, failures = asyncio.run(
+                        _drive_async(
+                            order_services, checkouts, concurrency, placed_orders, totals, pool
+                        )
+                    )
+                finally:
+                    stop_queue_logging(listener)
+            elif max_workers > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(
+                            order_services.submit_order, user, cart, PAYMENT_INFO
+                        ): (i, cart)
+                        for i, user, cart in checkouts
+                    }
+                    for future in as_completed(futures):
+                        i, cart = futures[future]
+                        order = future.result()
+                        pool.release(cart)
+                        if order:
+                            successes += 1
+                            placed_orders.append(order)
+                            totals.append(order.total)
+                            info("[ORDER %d] Success: %s, Total: %s", i + 1, order.order_id, order.total)
+                        else:
+                            failures += 1
+                            warning("[ORDER %d] Failed", i + 1)
+            else:
+                successes, failures = _drive(
+                    order_services, checkouts, num_orders, batch_size, placed_orders, totals, pool
+                )
+        t1 = time.time()
+
+        # 4. Print summary stats
+        print("\n--- STRESS TEST SUMMARY ---")
+        print(f"Total orders attempted:   {num_orders}")
+        print(f"Orders successfully placed: {successes}")
+        print(f"Failed attempts:          {failures}")
+        print(f"Total runtime:            {t1 - t0:.2f} seconds")
+        if successes:
+            # Totals live in a flat float array, so these are C-level scans
+            print(f"Avg order value:         ₹{sum(totals) / successes:.2f}")
+            print(f"Max order value:         ₹{max(totals):.2f}")
+            print(f"Min order value:         ₹{min(totals):.2f}")
 
+        # Optionally, test cancellation rate
+        cancels = 0
+        for index in _sample_indices(len(placed_orders), 20, rng):
+            order = placed_orders[index]
+            result = order_services.cancel_order(order.user_id, order.order_id)
+            if result:
+                cancels += 1
+                info("Order %s cancelled.", order.order_id)
+        if cancels:
+            print(f"Orders cancelled in test: {cancels}")
+
+    finally:
+        flush()
+        if verbose:
+            set_level(previous_level)
+        else:
+            enable()
     print("\n--- Stress Test Complete ---")
 
 
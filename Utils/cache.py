@@ -12,21 +12,51 @@ Key Responsibilities:
 
 Example Classes:
     LRUCache:   Least-recently-used cache implementation.
-    SimpleCache: Basic in-memory dictionary cache.
+    SimpleCache: Basic in-memory dictionary cache with a size cap.
+    TTLCache:    Size-capped cache whose entries expire after ttl seconds.
+    IntLRUCache: Approximate LRU for integer keys (e.g. product_id), backed by a ring buffer.
+
+Example Decorators:
+    memoize(maxsize=128):  Memoize a pure function (backed by functools.lru_cache).
+    cached_property:       Compute an attribute once per instance (re-exported from functools).
 
 Notes:
     Caching is optional but a great coding interview “bonus” and can reduce repeated computations.
 """
 
-from collections import OrderedDict
+import time
+from array import array
+from functools import cached_property, lru_cache
+
+
+def memoize(maxsize=128, typed=False):
+    """
+    Decorator that memoizes a pure function. Delegates to functools.lru_cache,
+    whose C implementation does the bookkeeping without Python-level overhead.
+    """
+    return lru_cache(maxsize=maxsize, typed=typed)
 
 
 class SimpleCache:
-    def __init__(self):
+    """
+    Bounded dict cache. Once maxsize is reached, the oldest inserted key is
+    dropped (dicts keep insertion order). Single dict operations are atomic
+    under the GIL, so no lock is needed.
+    """
+
+    __slots__ = ("store", "maxsize")
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("SimpleCache maxsize must be positive")
         self.store = {}
+        self.maxsize = maxsize
 
     def set(self, key, value):
-        self.store[key] = value
+        store = self.store
+        if key not in store and len(store) >= self.maxsize:
+            del store[next(iter(store))]
+        store[key] = value
 
     def get(self, key):
         return self.store.get(key, None)
@@ -35,26 +65,176 @@ class SimpleCache:
         self.store.clear()
 
 
+class TTLCache:
+    """
+    Like SimpleCache, but entries expire ttl seconds after being set.
+    Expiry is checked lazily on get against time.monotonic(); there is no
+    background sweeper.
+    """
+
+    __slots__ = ("store", "ttl", "maxsize")
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("TTLCache maxsize must be positive")
+        self.store = {}  # key -> (value, expires_at)
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+    def set(self, key, value):
+        store = self.store
+        if key in store:
+            del store[key]  # re-insert so insertion order tracks expiry order
+        elif len(store) >= self.maxsize:
+            del store[next(iter(store))]
+        store[key] = (value, time.monotonic() + self.ttl)
+
+    def get(self, key):
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            self.store.pop(key, None)
+            return None
+        return value
+
+    def clear(self):
+        self.store.clear()
+
+
+class _Node:
+    """Entry in LRUCache's recency list."""
+
+    __slots__ = ("key", "value", "prev", "next")
+
+    def __init__(self, key=None, value=None):
+        self.key = key
+        self.value = value
+        self.prev = None
+        self.next = None
+
+
 class LRUCache:
+    """
+    Dict of nodes plus a doubly-linked recency list: one dict lookup per
+    get/set and O(1) pointer splices. Most recently used sits after head,
+    the eviction candidate sits before tail.
+    """
+
+    __slots__ = ("map", "capacity", "head", "tail")
+
     def __init__(self, capacity: int = 5):
-        self.cache = OrderedDict()
+        self.map = {}
         self.capacity = capacity
+        self.head = _Node()  # sentinels: head.next is newest, tail.prev is oldest
+        self.tail = _Node()
+        self.head.next = self.tail
+        self.tail.prev = self.head
+
+    def _unlink(self, node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def _push_front(self, node):
+        first = self.head.next
+        node.prev = self.head
+        node.next = first
+        first.prev = node
+        self.head.next = node
 
     def get(self, key):
-        if key not in self.cache:
+        node = self.map.get(key)
+        if node is None:
             return None
-        # Move accessed key to the end (mark as most recently used)
-        self.cache.move_to_end(key)
-        return self.cache[key]
+        # Mark as most recently used
+        self._unlink(node)
+        self._push_front(node)
+        return node.value
 
     def set(self, key, value):
-        if key in self.cache:
-            # Update and move to end
-            self.cache.move_to_end(key)
-        self.cache[key] = value
+        node = self.map.get(key)
+        if node is not None:
+            # Update and mark as most recently used
+            node.value = value
+            self._unlink(node)
+            self._push_front(node)
+            return
+        node = self.map[key] = _Node(key, value)
+        self._push_front(node)
         # Evict least recently used
-        if len(self.cache) > self.capacity:
-            self.cache.popitem(last=False)
+        if len(self.map) > self.capacity:
+            oldest = self.tail.prev
+            self._unlink(oldest)
+            del self.map[oldest.key]
+
+    def __len__(self):
+        return len(self.map)
+
+    def __repr__(self):
+        items = []
+        node = self.tail.prev
+        while node is not self.head:  # oldest first, like the previous OrderedDict repr
+            items.append((node.key, node.value))
+            node = node.prev
+        return str(dict(items))
+
+
+class IntLRUCache:
+    """
+    Approximate LRU cache specialised for int keys, stored in a fixed-size
+    ring buffer: keys in an array('q'), values in a list, and a dict mapping
+    key -> slot. No per-entry node objects are allocated.
+    New entries overwrite the slot at head (the oldest). A hit swaps its
+    slot with the newest one instead of splicing it to the front, which is
+    cheaper than exact LRU ordering but only approximates it.
+    """
+
+    __slots__ = ("keys", "vals", "pos", "head", "size", "capacity")
+
+    def __init__(self, capacity: int = 128):
+        if capacity <= 0:
+            raise ValueError("IntLRUCache capacity must be positive")
+        self.keys = array("q", bytes(8 * capacity))
+        self.vals = [None] * capacity
+        self.pos = {}  # key -> slot
+        self.head = 0  # next slot to overwrite; head - 1 is the newest entry
+        self.size = 0
+        self.capacity = capacity
+
+    def get(self, key: int):
+        slot = self.pos.get(key)
+        if slot is None:
+            return None
+        newest = (self.head - 1) % self.capacity
+        if slot != newest:
+            # Promote: trade places with the newest entry
+            keys, vals, pos = self.keys, self.vals, self.pos
+            other = keys[newest]
+            keys[slot], keys[newest] = other, key
+            vals[slot], vals[newest] = vals[newest], vals[slot]
+            pos[other] = slot
+            pos[key] = newest
+            slot = newest
+        return self.vals[slot]
+
+    def set(self, key: int, value):
+        slot = self.pos.get(key)
+        if slot is not None:
+            self.vals[slot] = value
+            return
+        slot = self.head
+        if self.size == self.capacity:
+            del self.pos[self.keys[slot]]  # evict the oldest entry
+        else:
+            self.size += 1
+        self.keys[slot] = key
+        self.vals[slot] = value
+        self.pos[key] = slot
+        self.head = (slot + 1) % self.capacity
+
+    def __len__(self):
+        return self.size
 
     def __repr__(self):
-        return str(self.cache)
+        return str({key: self.vals[slot] for key, slot in self.pos.items()})
@@ -25,30 +25,30 @@ Notes:
 # Inventory-related
 class OutOfStockError(Exception):
     """Raised when trying to reserve or purchase more stock than available."""
-    pass
+    __slots__ = ()
 
 
 # Payment-related
 class PaymentFailedError(Exception):
     """Raised when payment processing fails in the payment gateway."""
-    pass
+    __slots__ = ()
 
 
 # Coupon/Discount-related
 class InvalidCouponError(Exception):
     """Raised when a coupon is invalid, expired, or not applicable."""
-    pass
+    __slots__ = ()
 
 class DiscountNotApplicableError(Exception):
     """Raised when discount conditions are not satisfied for a cart/order."""
-    pass
+    __slots__ = ()
 
 
 # Order-related
 class OrderNotFoundError(Exception):
     """Raised when trying to access or cancel a non-existent order."""
-    pass
+    __slots__ = ()
 
 class OrderAlreadyCancelledError(Exception):
     """Raised when cancelling an already-cancelled order."""
-    pass
\ No newline at end of file
+    __slots__ = ()
\ No newline at end of file
@@ -14,36 +14,124 @@ Key Responsibilities:
     - Make error tracking and monitoring easier during development and testing.
 
 Example Methods:
-    info(msg):     Log a general system action or event.
-    warning(msg):  Log a warning condition (non-fatal issues).
-    error(msg):    Log an error, exception, or failure scenario.
-    debug(msg):    (Optional) Log detailed trace/debug info for developers.
+    info(msg, *args):     Log a general system action or event.
+    warning(msg, *args):  Log a warning condition (non-fatal issues).
+    error(msg, *args):    Log an error, exception, or failure scenario.
+    debug(msg, *args):    (Optional) Log detailed trace/debug info for developers.
+    set_level(level): Change the minimum level that gets emitted (e.g. "WARNING").
+    flush():          Write out records still buffered for the log file.
+    disable() / enable(): Drop all records cheaply, then resume logging as before.
+    start_queue_logging(log_queue=None) / stop_queue_logging(listener): Hand record I/O to a background thread.
+    use_queue(log_queue): Send this process's records to another process's listener.
 
 Notes:
     - All services (PaymentGateway, OrderServices, Inventory, DiscountManager, etc.)
       should import and use this logger for consistent output.
     - Update configuration (format, file handlers) here to propagate everywhere.
+    - The starting level comes from config.LOG_LEVEL.
+    - Records go to config.LOG_FILE_PATH (buffered, rotated at 10 MB); set the
+      VERBOSE environment variable to also echo them to stderr.
 """
 import logging
+import os
+import queue
+from logging.handlers import (
+    MemoryHandler,
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
+from config import LOG_LEVEL, LOG_FILE_PATH
 
 # Configure logger only once
 logger = logging.getLogger("ecommerce")
 if not logger.hasHandlers():  # Prevent duplicate handlers if re-imported
-    logger.setLevel(logging.DEBUG)  # Capture all levels, handlers can filter
-    handler = logging.StreamHandler()  # Console output
+    logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
     formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # File output: records are buffered in memory and written in batches
+    # (or as soon as an ERROR arrives); the file is only opened on first write
+    file_handler = RotatingFileHandler(
+        LOG_FILE_PATH, maxBytes=10_000_000, backupCount=3, delay=True
+    )
+    file_handler.setFormatter(formatter)
+    logger.addHandler(
+        MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+    )
+    if os.environ.get("VERBOSE"):
+        handler = logging.StreamHandler()  # Console output
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
 
 # Utility functions (simple wrappers)
-def info(msg):
-    logger.info(msg)
+# Messages take %-style args, which are only formatted when the level is enabled
+def info(msg, *args):
+    logger.info(msg, *args)
 
-def warning(msg):
-    logger.warning(msg)
+def warning(msg, *args):
+    logger.warning(msg, *args)
 
-def error(msg):
-    logger.error(msg)
+def error(msg, *args):
+    logger.error(msg, *args)
 
-def debug(msg):
-    logger.debug(msg)
+def debug(msg, *args):
+    logger.debug(msg, *args)
+
+def set_level(level):
+    """
+    Set the logger threshold; accepts a level name ("INFO") or number.
+    Returns the previous level, so callers can restore it.
+    """
+    previous = logger.level
+    logger.setLevel(level)
+    return previous
+
+def flush():
+    """Write out any buffered records (call at the end of a run)."""
+    for handler in logger.handlers:
+        handler.flush()
+
+def disable():
+    """
+    Silence the logger until enable(): records are rejected by the enabled
+    check and never formatted. Handlers are kept, and flushed first so no
+    buffered records are lost.
+    """
+    flush()
+    logger.disabled = True
+
+def enable():
+    """Undo disable(); the handlers and level in place before are used again."""
+    logger.disabled = False
+
+def start_queue_logging(log_queue=None):
+    """
+    Route records through a QueueHandler so callers (e.g. an asyncio event
+    loop) only enqueue; a background listener thread does the formatting
+    and I/O with the current handlers. Pass a multiprocessing.Queue as
+    log_queue to also collect records from worker processes (see use_queue).
+    Returns the listener for stop_queue_logging().
+    """
+    handlers = list(logger.handlers)
+    if log_queue is None:
+        log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
+
+def use_queue(log_queue):
+    """
+    Replace this process's handlers with a QueueHandler on log_queue, so a
+    worker process never writes the log file itself and the parent's
+    listener does all the I/O. Usable as a multiprocessing.Pool initializer.
+    """
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
+
+def stop_queue_logging(listener):
+    """Drain the queue and hand the original handlers back to the logger."""
+    listener.stop()
+    logger.handlers.clear()
+    for handler in listener.handlers:
+        logger.addHandler(handler)
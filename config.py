@@ -3,11 +3,15 @@ config.py
 
 Central configuration for the E-commerce Simulation System.
 Contains all tunable system constants for easy maintenance and experimentation.
+The same values are bundled in the immutable, picklable CFG tuple at the bottom.
 """
 
+from typing import NamedTuple, Tuple
+
 # --- Inventory & Product Config ---
 DEFAULT_PRODUCT_STOCK = 20
 INVENTORY_LOW_STOCK_THRESHOLD = 3
+INVENTORY_RESERVATION_TTL_SEC = 15 * 60  # Unconsumed checkout holds expire after this
 
 # --- Payment Gateway ---
 PAYMENT_SUCCESS_RATE = 0.97           # 97% payments will succeed by default
@@ -37,4 +41,33 @@ ENABLE_CONCURRENT_ORDERS = False      # For advanced simulation/workload
 # --- Feature Flags / Toggles (Optional) ---
 ENABLE_EMAIL_NOTIFICATIONS = False
 
+
+
+class _Cfg(NamedTuple):
+    """Snapshot of the constants above, read as CFG.NAME (tuple slot access)."""
+
+    DEFAULT_PRODUCT_STOCK: int = DEFAULT_PRODUCT_STOCK
+    INVENTORY_LOW_STOCK_THRESHOLD: int = INVENTORY_LOW_STOCK_THRESHOLD
+    INVENTORY_RESERVATION_TTL_SEC: float = INVENTORY_RESERVATION_TTL_SEC
+    PAYMENT_SUCCESS_RATE: float = PAYMENT_SUCCESS_RATE
+    PAYMENT_PROCESS_DELAY_SEC: float = PAYMENT_PROCESS_DELAY_SEC
+    DEFAULT_COUPON_CODES: Tuple[str, ...] = tuple(DEFAULT_COUPON_CODES)
+    SITEWIDE_DISCOUNT_PERCENT: float = SITEWIDE_DISCOUNT_PERCENT
+    NUM_USERS_STRESS_TEST: int = NUM_USERS_STRESS_TEST
+    NUM_PRODUCTS_STRESS_TEST: int = NUM_PRODUCTS_STRESS_TEST
+    NUM_ORDERS_STRESS_TEST: int = NUM_ORDERS_STRESS_TEST
+    MAX_CART_ITEMS_PER_USER: int = MAX_CART_ITEMS_PER_USER
+    COUPON_PROBABILITY: float = COUPON_PROBABILITY
+    STRESS_TEST_PAYMENT_SUCCESS_RATE: float = STRESS_TEST_PAYMENT_SUCCESS_RATE
+    LOG_LEVEL: str = LOG_LEVEL
+    LOG_FILE_PATH: str = LOG_FILE_PATH
+    RANDOM_SEED: int = RANDOM_SEED
+    ENABLE_AUTO_REFUNDS: bool = ENABLE_AUTO_REFUNDS
+    ENABLE_CONCURRENT_ORDERS: bool = ENABLE_CONCURRENT_ORDERS
+    ENABLE_EMAIL_NOTIFICATIONS: bool = ENABLE_EMAIL_NOTIFICATIONS
+
+
+# Module-level names above stay for existing imports
+CFG = _Cfg()
+
 # Add more as your project grows!
@@ -20,8 +20,7 @@ def main():
 
     # 2. Initialize services
     inventory = Inventory()
-    for product in products:
-        inventory.add_product(product)
+    inventory.add_products(products)
 
     payment_gateway = PaymentProcessor(success_rate=0.95)
     order_services = OrderServices(inventory, payment_gateway)
@@ -0,0 +1,49 @@
+"""
+Discount Arithmetic Kernels
+
+Purpose:
+    Plain-number helpers for the discount math shared by Coupon and
+    DiscountManager. They take discount types as small integer codes and
+    values as floats (or flat arrays of them), so hot loops stay free of
+    object attribute lookups and the fixed/percentage rules live in one place.
+
+Example Functions:
+    discount_amount(kind, value, subtotal): Discount a single rule grants on a subtotal.
+    best_discount_total(types, values, min_orders, group_ids, num_groups, subtotal):
+        Best eligible discount per stackability group, summed across groups.
+
+Notes:
+    Internal to the models/services layer; callers convert "fixed"/"percentage"
+    strings with DISCOUNT_TYPE_CODES once, up front.
+"""
+
+# Integer codes for discount types
+FIXED, PERCENTAGE, UNKNOWN = 0, 1, -1
+DISCOUNT_TYPE_CODES = {"fixed": FIXED, "percentage": PERCENTAGE}
+
+
+def discount_amount(kind: int, value: float, subtotal: float) -> float:
+    """
+    Discount granted on subtotal: fixed amounts are capped at the subtotal,
+    percentages are rounded to paise. Unknown types grant nothing.
+    """
+    if kind == FIXED:
+        return min(value, subtotal)
+    if kind == PERCENTAGE:
+        return round(subtotal * (value / 100), 2)
+    return 0.0
+
+
+def best_discount_total(types, values, min_orders, group_ids, num_groups, subtotal):
+    """
+    The best eligible discount in each stackability group, summed across
+    groups. Rules whose min_order exceeds subtotal are skipped.
+    """
+    best = [0.0] * num_groups
+    for kind, value, min_order, group in zip(types, values, min_orders, group_ids):
+        if subtotal < min_order:
+            continue
+        amount = discount_amount(kind, value, subtotal)
+        if amount > best[group]:
+            best[group] = amount
+    return sum(best)
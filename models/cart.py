@@ -12,30 +12,91 @@ Attributes:
     user_id: Identifier for the user who owns the cart (int or string)
     items: Dictionary holding cart products and their quantities
            (e.g., {product_id: (Product object, quantity)})
-    applied_coupons: List of Coupon objects currently applied to the cart
+    applied_coupons: Dict of Coupon objects currently applied to the cart, keyed by coupon code
     created_at: Timestamp of when the cart was created (optional)
-    updated_at: Timestamp for the cart's last modification (optional)
+    updated_at: Timestamp for the cart's last modification (optional); mutations only
+                record a monotonic clock reading, converted to a datetime when read
 
 Methods:
     add_item(product, quantity): Add a product and quantity to the cart; increases quantity if already present
+    add_items(pairs): Add many (product, quantity) pairs in one batch
     remove_item(product, quantity): Remove a quantity of a product from the cart
     update_quantity(product, new_quantity): Adjust the quantity for a given product; removes if quantity is zero or less
     clear(): Remove all items and coupons from the cart
-    view_items(): Return/display a summary of current items, quantities, and subtotal
+    transfer(): Hand over the items/coupons containers without copying and leave the cart empty
+    iter_quantities(): Yield (product_id, quantity) pairs for every line
+    render_items(): Return the items table (quantities, unit prices, subtotal) as a string
+    view_items(): Print the table from render_items()
     apply_coupon(coupon): Attempt to apply a coupon to the cart if valid
     remove_coupon(coupon): Remove an applied coupon from the cart
     calculate_subtotal(): Calculate the price total of all items before discounts
     calculate_total(): Calculate final total after applying discounts/coupons
-    list_coupons(): Display summary of coupons currently applied
+    list_coupons(): Log (at DEBUG) a summary of coupons currently applied
     is_empty(): Return True if the cart has no items; False otherwise
     get_cart_info(): Return a complete overview of the cart: items, subtotal, coupons, and total
 """
 
-from datetime import datetime
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+from operator import attrgetter, mul
+from models.coupon import coupon_code
 from models.product import Product
+from Utils.logger import logger
+
+
+# Table templates for render_items, built once at import
+_ROW_FMT = "{:<20} {:<5} ₹{:<12.2f} ₹{:<10.2f}".format
+# Fixed label columns are filled in once, leaving only the amount field
+_TOTAL_FMT = "{:<20} {:<5} {:<12} ₹{{:<10.2f}}".format("Total", "", "").format
+_HEADER_ROW = "{:<20} {:<5} {:<12} {:<10}".format("Product", "Qty", "Unit Price", "Subtotal")
+_RULE = "-" * 55
+
+
+_price_of = attrgetter("price")
+
+
+class _FixedAdapter:
+    """
+    Wraps a coupon-like value without get_discount (an object with only a
+    discount_value, or a bare number) so every applied coupon has the same
+    get_discount(cart, subtotal) interface. The amount is flat, as before.
+    """
+
+    __slots__ = ("code", "value")
+
+    def __init__(self, coupon):
+        self.code = coupon_code(coupon)
+        self.value = float(
+            coupon.discount_value if hasattr(coupon, "discount_value") else coupon
+        )
+
+    def get_discount(self, cart, subtotal=None):
+        return self.value
+
+
+def _as_coupon(coupon):
+    """Return coupon itself if it can price a discount, else a _FixedAdapter for it."""
+    return coupon if hasattr(coupon, "get_discount") else _FixedAdapter(coupon)
 
 
 class Cart:
+    __slots__ = (
+        "cart_id",
+        "user_id",
+        "items",
+        "applied_coupons",
+        "created_at",
+        "_updated_ns",
+        "_wall_base",
+        "_mono_base",
+        "_index",
+        "_pids",
+        "_products",
+        "_qtys",
+    )
+
     def __init__(
         self,
         cart_id,
@@ -50,113 +111,241 @@ class Cart:
         self.items = (
             items if items is not None else {}
         )  # {product_id: (Product, quantity)}
-        self.applied_coupons = applied_coupons if applied_coupons is not None else []
-        self.created_at = created_at if created_at is not None else datetime.now()
+        if applied_coupons is None:
+            applied_coupons = {}
+        elif not isinstance(applied_coupons, dict):
+            applied_coupons = {coupon_code(c): _as_coupon(c) for c in applied_coupons}
+        self.applied_coupons = applied_coupons  # {code: Coupon}
+        # Wall-clock/monotonic pair captured together, so a monotonic reading
+        # can later be turned back into a datetime
+        self._wall_base = datetime.now()
+        self._mono_base = time.monotonic_ns()
+        self.created_at = created_at if created_at is not None else self._wall_base
         self.updated_at = updated_at if updated_at is not None else self.created_at
+        # Struct-of-arrays mirror of self.items: parallel per-line sequences plus
+        # a product_id -> position index, so numeric passes avoid tuple unpacking.
+        # Quantities are a packed int64 array; prices are always read live from
+        # the products, so Product.set_price is reflected immediately.
+        self._index = {}
+        self._pids = []
+        self._products = []
+        self._qtys = array("q")
+        for pid, (product, quantity) in self.items.items():
+            self._append_line(pid, product, quantity)
 
-    def add_item(self, product, quantity):
+    @property
+    def updated_at(self):
+        return self._wall_base + timedelta(
+            microseconds=(self._updated_ns - self._mono_base) // 1000
+        )
+
+    @updated_at.setter
+    def updated_at(self, value):
+        offset = value - self._wall_base
+        self._updated_ns = self._mono_base + (
+            (offset.days * 86400 + offset.seconds) * 1_000_000 + offset.microseconds
+        ) * 1000
+
+    def _append_line(self, pid, product, quantity):
+        # The typed array goes first: it rejects a non-integer quantity with
+        # TypeError before any other state changes
+        self._qtys.append(quantity)
+        self._index[pid] = len(self._pids)
+        self._pids.append(pid)
+        self._products.append(product)
+
+    def _set_line(self, product, quantity):
+        """Insert or overwrite the line for product, in both items and the arrays."""
+        pid = product.product_id
+        i = self._index.get(pid)
+        if i is None:
+            self._append_line(pid, product, quantity)
+        else:
+            # Array write first, as in _append_line, so a bad value changes nothing
+            self._qtys[i] = quantity
+            self._products[i] = product
+        self.items[pid] = (product, quantity)
+
+    def _drop_line(self, pid):
+        """Remove a line; the last line is swapped into its slot to keep arrays dense."""
+        del self.items[pid]
+        i = self._index.pop(pid)
+        last = len(self._pids) - 1
+        if i != last:
+            last_pid = self._pids[last]
+            self._pids[i] = last_pid
+            self._products[i] = self._products[last]
+            self._qtys[i] = self._qtys[last]
+            self._index[last_pid] = i
+        self._pids.pop()
+        self._products.pop()
+        self._qtys.pop()
+
+    def _merge_line(self, product, quantity):
+        """Add quantity to product's line, dropping the line if it falls to zero or below."""
         pid = product.product_id
-        if pid in self.items:
-            existing_product, existing_qty = self.items[pid]
-            new_qty = existing_qty + quantity
+        i = self._index.get(pid)
+        if i is not None:
+            new_qty = self._qtys[i] + quantity
             if new_qty <= 0:
-                del self.items[pid]
+                self._drop_line(pid)
             else:
-                self.items[pid] = (product, new_qty)
+                self._set_line(product, new_qty)
         else:
             if quantity > 0:
-                self.items[pid] = (product, quantity)
-        self.updated_at = datetime.now()
+                self._set_line(product, quantity)
+
+    def add_item(self, product, quantity):
+        self._merge_line(product, quantity)
+        self._updated_ns = time.monotonic_ns()
+
+    def add_items(self, pairs):
+        """
+        Add several (product, quantity) pairs with add_item semantics, but with
+        a single timestamp update for the whole batch.
+        """
+        merge = self._merge_line
+        for product, quantity in pairs:
+            merge(product, quantity)
+        self._updated_ns = time.monotonic_ns()
 
     def remove_item(self, product, quantity):
-        self.add_item(product, -quantity)
+        """
+        Take quantity off product's line, dropping it at zero. As with
+        add_item(product, -quantity), a negative quantity for a product not
+        yet in the cart adds it.
+        """
+        pid = product.product_id
+        i = self._index.get(pid)
+        if i is None:
+            self._merge_line(product, -quantity)
+        else:
+            new_qty = self._qtys[i] - quantity
+            if new_qty <= 0:
+                self._drop_line(pid)
+            else:
+                self._qtys[i] = new_qty  # first: rejects a non-integer quantity
+                self.items[pid] = (self._products[i], new_qty)
+        self._updated_ns = time.monotonic_ns()
 
     def update_quantity(self, product, new_quantity):
         pid = product.product_id
-        if pid in self.items:
+        if pid in self._index:
             if new_quantity > 0:
-                self.items[pid] = (product, new_quantity)
+                self._set_line(product, new_quantity)
             else:
-                del self.items[pid]
-            self.updated_at = datetime.now()
+                self._drop_line(pid)
+            self._updated_ns = time.monotonic_ns()
 
     def clear(self):
         self.items.clear()
+        self._index.clear()
+        self._pids.clear()
+        self._products.clear()
+        del self._qtys[:]  # array.array has no clear()
         self.applied_coupons.clear()
-        self.updated_at = datetime.now()
+        self._updated_ns = time.monotonic_ns()
 
-    def view_items(self):
+    def transfer(self):
+        """
+        Hand this cart's items and coupons containers to the caller (e.g. a new
+        Order) without copying, and rebind the cart to fresh empty ones.
+        Returns (items, applied_coupons).
+        """
+        items, coupons = self.items, self.applied_coupons
+        self.items = {}
+        self.applied_coupons = {}
+        self._index = {}
+        self._pids = []
+        self._products = []
+        self._qtys = array("q")
+        self._updated_ns = time.monotonic_ns()
+        return items, coupons
+
+    def _line_prices(self):
+        """Live unit price of every line, in line order."""
+        return list(map(_price_of, self._products))
+
+    def iter_quantities(self):
+        """Yield (product_id, quantity) for every line in the cart."""
+        return zip(self._pids, self._qtys)
+
+    def render_items(self):
+        """Return the cart table (items, quantities, subtotal) as a string, without printing."""
         if not self.items:
-            print("Cart is empty.")
-            return
-        print(f"{'Product':<20} {'Qty':<5} {'Unit Price':<12} {'Subtotal':<10}")
-        print("-" * 55)
-        total = 0
-        for pid, (product, quantity) in self.items.items():
-            subtotal = product.price * quantity
-            total += subtotal
-            print(
-                f"{product.name:<20} {quantity:<5} ₹{product.price:<12.2f} ₹{subtotal:<10.2f}"
+            return "Cart is empty.\n"
+        prices = self._line_prices()
+        line_subtotals = list(map(mul, prices, self._qtys))
+        rows = [_HEADER_ROW, _RULE]
+        rows.extend(
+            map(
+                _ROW_FMT,
+                [product.name for product in self._products],
+                self._qtys,
+                prices,
+                line_subtotals,
             )
-        print("-" * 55)
-        print(f"{'Total':<20} {'':<5} {'':<12} ₹{total:<10.2f}")
+        )
+        rows.append(_RULE)
+        rows.append(_TOTAL_FMT(sum(line_subtotals)))
+        rows.append("")
+        return "\n".join(rows)
+
+    def view_items(self):
+        # Emit the whole table with a single write
+        sys.stdout.write(self.render_items())
 
     def apply_coupon(self, coupon):
         """
         Applies coupon if not already applied.
         Assumes coupon is a valid object and validation is handled elsewhere.
         """
-        if coupon not in self.applied_coupons:
-            self.applied_coupons.append(coupon)
-            self.updated_at = datetime.now()
-            print(
-                f"Coupon {coupon.code if hasattr(coupon, 'code') else coupon} applied."
-            )
+        code = coupon_code(coupon)
+        if code not in self.applied_coupons:
+            self.applied_coupons[code] = _as_coupon(coupon)
+            self._updated_ns = time.monotonic_ns()
+            logger.debug("Coupon %s applied.", code)
         else:
-            print(
-                f"Coupon {coupon.code if hasattr(coupon, 'code') else coupon} is already applied."
-            )
+            logger.debug("Coupon %s is already applied.", code)
 
     def remove_coupon(self, coupon):
         """
         Removes the specified coupon if it's currently applied.
         """
-        if coupon in self.applied_coupons:
-            self.applied_coupons.remove(coupon)
-            self.updated_at = datetime.now()
-            print(
-                f"Coupon {coupon.code if hasattr(coupon, 'code') else coupon} removed."
-            )
+        code = coupon_code(coupon)
+        if self.applied_coupons.pop(code, None) is not None:
+            self._updated_ns = time.monotonic_ns()
+            logger.debug("Coupon %s removed.", code)
         else:
-            print(
-                f"Coupon {coupon.code if hasattr(coupon, 'code') else coupon} is not in the cart."
-            )
+            logger.debug("Coupon %s is not in the cart.", code)
 
     def calculate_subtotal(self):
-        return sum(
-            product.price * quantity for product, quantity in self.items.values()
-        )
+        """
+        Returns the pre-discount total at the products' current prices.
+        """
+        return sum(map(mul, map(_price_of, self._products), self._qtys), 0.0)
 
     def calculate_total(self):
+        """
+        Returns the total after coupons. Not cached: a coupon's discount also
+        depends on its own state (active flag, usage count, validity window).
+        """
         subtotal = self.calculate_subtotal()
-        total_discount = 0
-        for coupon in self.applied_coupons:
-            if hasattr(coupon, "get_discount"):
-                total_discount += coupon.get_discount(self)
-            elif hasattr(coupon, "discount_value"):
-                total_discount += coupon.discount_value
-            else:
-                total_discount += float(coupon)
+        # Every applied coupon exposes get_discount (plain values are wrapped
+        # at apply time), so there is one call per coupon and no probing
+        total_discount = sum(
+            coupon.get_discount(self, subtotal)
+            for coupon in self.applied_coupons.values()
+        )
         return max(0, subtotal - total_discount)
 
     def list_coupons(self):
         if not self.applied_coupons:
-            print("No coupons applied.")
+            logger.debug("No coupons applied.")
         else:
-            print("Applied coupons:")
-            for coupon in self.applied_coupons:
-                code = coupon.code if hasattr(coupon, "code") else str(coupon)
-                print(f"- {code}")
+            logger.debug("Applied coupons:")
+            for code in self.applied_coupons:
+                logger.debug("- %s", code)
 
     def is_empty(self):
         return len(self.items) == 0
@@ -165,24 +354,28 @@ class Cart:
         """
         Returns a summary dict of the cart's contents and totals.
         """
+        prices = self._line_prices()
         products = [
             {
-                "product_id": product.product_id,
+                "product_id": pid,
                 "name": product.name,
                 "quantity": quantity,
-                "unit_price": product.price,
-                "subtotal": product.price * quantity,
+                "unit_price": price,
+                "subtotal": subtotal,
             }
-            for product, quantity in self.items.values()
+            for pid, product, price, quantity, subtotal in zip(
+                self._pids,
+                self._products,
+                prices,
+                self._qtys,
+                map(mul, prices, self._qtys),
+            )
         ]
         return {
             "cart_id": self.cart_id,
             "user_id": self.user_id,
             "products": products,
-            "applied_coupons": [
-                coupon.code if hasattr(coupon, "code") else str(coupon)
-                for coupon in self.applied_coupons
-            ],
+            "applied_coupons": list(self.applied_coupons),  # keys are the codes
             "subtotal": self.calculate_subtotal(),
             "total": self.calculate_total(),
             "created_at": self.created_at,
@@ -14,25 +14,48 @@ Attributes:
     min_order_value: Minimum cart/order total required to apply the coupon (optional)
     valid_from: Datetime indicating when the coupon becomes active (optional)
     valid_until: Datetime after which the coupon is expired (optional)
-    applicable_categories: List of product categories this coupon can be applied to (optional)
+    applicable_categories: Frozenset of product categories this coupon can be applied to (optional)
     max_uses: Total number of times this coupon can be used per customer or in total (optional)
     usage_count: Tracks number of times the coupon has been used (optional)
     (Optional) is_active: Boolean flag for internal deactivation
 
 Methods:
-    is_valid(cart): Checks if the coupon can be applied to the given cart (validity, order value, etc.)
-    get_discount(cart): Calculates the discount amount for the given cart.
+    is_valid(cart, subtotal=None): Checks if the coupon can be applied to the given cart (validity, order value, etc.)
+    get_discount(cart, subtotal=None): Calculates the discount amount for the given cart.
+        Both accept the cart's precomputed subtotal to avoid recomputing it.
     apply(coupon, cart): Applies coupon logic to a cart (if not already applied).
     increment_usage(): Increments the coupon usage count.
     (Optional) deactivate(): Soft-deletes or disables the coupon.
     (Optional) can_be_used_by(user): Checks if a particular user is eligible.
+
+Functions:
+    coupon_code(coupon): Key a coupon (or a bare code/amount) is stored under in applied_coupons.
 """
 
 from datetime import datetime
-from .cart import Cart
+from ._fastmath import DISCOUNT_TYPE_CODES, UNKNOWN, discount_amount
+
+
+def coupon_code(coupon):
+    """Key a coupon is stored under in Cart/Order.applied_coupons."""
+    return coupon.code if hasattr(coupon, "code") else str(coupon)
 
 
 class Coupon:
+    __slots__ = (
+        "code",
+        "description",
+        "discount_type",
+        "discount_value",
+        "min_order_value",
+        "valid_from",
+        "valid_until",
+        "applicable_categories",
+        "max_uses",
+        "usage_count",
+        "is_active",
+    )
+
     def __init__(
         self,
         code,
@@ -53,46 +76,50 @@ class Coupon:
         self.min_order_value = min_order_value
         self.valid_from = valid_from
         self.valid_until = valid_until
-        self.applicable_categories = applicable_categories or []
+        # Frozen once so each cart line's category check is a hash lookup
+        self.applicable_categories = frozenset(applicable_categories or ())
         self.max_uses = max_uses
         self.usage_count = 0  # Always starts at 0
         self.is_active = is_active
 
-    def is_valid(self, cart):
-        now = datetime.now()
-
+    def is_valid(self, cart, subtotal=None):
         if not self.is_active:
             return False, "Coupon is not active."
-        if self.valid_from and now < self.valid_from:
-            return False, "Coupon not yet valid."
-        if self.valid_until and now > self.valid_until:
-            return False, "Coupon expired."
+        valid_from, valid_until = self.valid_from, self.valid_until
+        # Only read the clock for coupons that actually have a validity window
+        if valid_from or valid_until:
+            now = datetime.now()
+            if valid_from and now < valid_from:
+                return False, "Coupon not yet valid."
+            if valid_until and now > valid_until:
+                return False, "Coupon expired."
         if self.max_uses is not None and self.usage_count >= self.max_uses:
             return False, "Coupon max usage reached."
-        if cart.calculate_subtotal() < self.min_order_value:
+        if subtotal is None:
+            subtotal = cart.calculate_subtotal()
+        if subtotal < self.min_order_value:
             return (
                 False,
                 f"Order value is below the minimum required ₹{self.min_order_value}.",
             )
-        if self.applicable_categories:
-            found = any(
-                product.category in self.applicable_categories
-                for product, quantity in cart.items.values()
-            )
-            if not found:
-                return False, "No eligible products for this coupon."
+        categories = self.applicable_categories
+        if categories and not any(
+            product.category in categories for product, _ in cart.items.values()
+        ):
+            return False, "No eligible products for this coupon."
         return True, "Coupon is valid."
 
-    def get_discount(self, cart):
-        is_valid, msg = self.is_valid(cart)
+    def get_discount(self, cart, subtotal=None):
+        if subtotal is None:
+            subtotal = cart.calculate_subtotal()
+        is_valid, msg = self.is_valid(cart, subtotal)
         if not is_valid:
             return 0.0
-        subtotal = cart.calculate_subtotal()
-        if self.discount_type == "fixed":
-            return min(self.discount_value, subtotal)
-        elif self.discount_type == "percentage":
-            return round(subtotal * (self.discount_value / 100), 2)
-        return 0.0
+        return discount_amount(
+            DISCOUNT_TYPE_CODES.get(self.discount_type, UNKNOWN),
+            self.discount_value,
+            subtotal,
+        )
 
     def increment_usage(self):
         self.usage_count += 1
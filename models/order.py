@@ -11,17 +11,21 @@ Attributes:
     user_id: Identifier for the user who placed the order (int or string)
     items: Dictionary or list holding purchased products and their quantities
            (e.g., {product_id: (Product object, quantity)})
-    applied_coupons: List of Coupon objects used for this order
+    applied_coupons: Dict of Coupon objects used for this order, keyed by coupon code
+                     (a plain list of coupons is converted on construction)
     subtotal: Total price of all items before discounts (float)
     total: Final order total after applying discounts/coupons (float)
     status: Current status of the order (e.g., "Placed", "Confirmed", "Shipped", "Delivered", "Cancelled")
     order_date: Timestamp of when the order was placed
     (Optional) shipping_address: Delivery address for the order
     (Optional) payment_info: Record of payment method or transaction details
+    (Optional) payment_ref: Gateway reference of the captured payment, None until paid
     (Optional) order_notes: Freeform notes (e.g., delivery instructions)
 
 Methods:
-    __init__(...): Initialize an Order from parameters or a Cart instance
+    __init__(...): Dataclass constructor
+    from_cart(order_id, cart, ..., move=False): Alternate constructor that copies (or, with move=True, moves) a Cart's contents into an Order
+    products_view: Per-line receipt as OrderLine tuples, computed on first access and cached
     update_status(new_status): Change the current order status
     get_order_info(): Return a summary of the order as a dictionary (order slip/receipt)
     __str__(): Display a concise summary of the order for logs/reports
@@ -29,37 +33,68 @@ Methods:
     (Optional) add_order_note(note): Attach administrative or customer note
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 from .cart import Cart
+from .coupon import coupon_code
 from .product import Product
 
 
+class OrderLine(NamedTuple):
+    """One immutable receipt line of an Order."""
+
+    product_id: Any
+    name: str
+    quantity: int
+    unit_price: float
+    subtotal: float
+
+
+@dataclass(slots=True, eq=False)
 class Order:
-    def __init__(
-        self,
-        order_id,
-        user_id,
-        items,
-        subtotal,
-        total,
-        applied_coupons,
-        order_date,
-        status="Placed",
-        shipping_address=None,
-        payment_info=None,
-        order_notes=None,
-    ):
-        self.order_id = order_id
-        self.user_id = user_id
-        self.items = items
-        self.subtotal = subtotal
-        self.total = total
-        self.applied_coupons = applied_coupons
-        self.order_date = order_date
-        self.status = status
-        self.shipping_address = shipping_address
-        self.payment_info = payment_info
-        self.order_notes = order_notes
+    order_id: Any
+    user_id: Any
+    items: Dict[Any, Tuple[Product, int]]
+    subtotal: float
+    total: float
+    applied_coupons: Dict[str, Any]
+    order_date: datetime
+    status: str = "Placed"
+    shipping_address: Optional[str] = None
+    payment_info: Optional[Dict[str, Any]] = None
+    order_notes: Optional[str] = None
+    payment_ref: Optional[str] = None
+    # Receipt lines, built on first use: items don't change after checkout
+    _products_view: Optional[Tuple[OrderLine, ...]] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
+    def __post_init__(self):
+        # Accept the older list-of-coupons form too; stored keyed by code like Cart
+        if not isinstance(self.applied_coupons, dict):
+            self.applied_coupons = {coupon_code(c): c for c in self.applied_coupons}
+
+    @property
+    def products_view(self):
+        """
+        Immutable per-line receipt (OrderLine tuples), built on first access
+        and reused afterwards. A hand-rolled cached_property: slotted
+        dataclasses have no __dict__.
+        """
+        view = self._products_view
+        if view is None:
+            view = self._products_view = tuple(
+                OrderLine(
+                    product.product_id,
+                    product.name,
+                    quantity,
+                    product.price,
+                    product.price * quantity,
+                )
+                for product, quantity in self.items.values()
+            )
+        return view
 
     @classmethod
     def from_cart(
@@ -70,18 +105,28 @@ class Order:
         shipping_address=None,
         payment_info=None,
         order_notes=None,
+        move=False,
     ):
         """
         Alternate constructor: create an Order from a Cart object,
         copying over products, coupons, totals etc.
+        With move=True the cart's items and coupons containers are handed to
+        the order (Cart.transfer) instead of copied, leaving the cart empty;
+        only use it when the caller discards the cart afterwards.
         """
+        subtotal = cart.calculate_subtotal()
+        total = cart.calculate_total()
+        if move:
+            items, applied_coupons = cart.transfer()
+        else:
+            items, applied_coupons = cart.items.copy(), dict(cart.applied_coupons)
         return cls(
             order_id=order_id,
             user_id=cart.user_id,
-            items=cart.items.copy(),
-            subtotal=cart.calculate_subtotal(),
-            total=cart.calculate_total(),
-            applied_coupons=cart.applied_coupons.copy(),
+            items=items,
+            subtotal=subtotal,
+            total=total,
+            applied_coupons=applied_coupons,
             order_date=datetime.now(),
             status=status,
             shipping_address=shipping_address,
@@ -93,24 +138,12 @@ class Order:
         self.status = new_status
 
     def get_order_info(self):
-        products = [
-            {
-                "product_id": product.product_id,
-                "name": product.name,
-                "quantity": quantity,
-                "unit_price": product.price,
-                "subtotal": product.price * quantity,
-            }
-            for product, quantity in self.items.values()
-        ]
         return {
             "order_id": self.order_id,
             "user_id": self.user_id,
-            "products": products,
-            "applied_coupons": [
-                coupon.code if hasattr(coupon, "code") else str(coupon)
-                for coupon in self.applied_coupons
-            ],
+            # Fresh containers per call, so callers can't alter the cached lines
+            "products": [line._asdict() for line in self.products_view],
+            "applied_coupons": list(self.applied_coupons),  # keys are the codes
             "subtotal": self.subtotal,
             "total": self.total,
             "order_date": self.order_date,
@@ -23,6 +23,8 @@ Methods:
 
 
 class Product:
+    __slots__ = ("product_id", "name", "price", "stock", "description", "category")
+
     def __init__(
         self, product_id, name, price, stock, description="", category="General"
     ):
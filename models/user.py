@@ -33,8 +33,21 @@ from models.order import Order
 from models.product import Product
 from datetime import datetime
 
+__all__ = ["User"]
+
 
 class User:
+    __slots__ = (
+        "user_id",
+        "name",
+        "email",
+        "address",
+        "phone",
+        "current_cart",
+        "order_history",
+        "payment_methods",
+    )
+
     def __init__(self, user_id, name, email, address=None, phone=None):
         self.user_id = user_id
         self.name = name
@@ -68,6 +81,7 @@ class User:
             shipping_address=shipping_address or self.address,
             payment_info=payment_info,
             order_notes=order_notes,
+            move=True,  # the cart is replaced below, so its contents can move
         )
         self.order_history.append(order)
         # Create new empty cart with unique cart_id for the user